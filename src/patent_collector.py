@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from operator import itemgetter
 from typing import List, Dict, Any
+import heapq
 import logging
 import os
+import re
 
 import requests
 
+try:
+    import ahocorasick  # pyahocorasick (opzionale)
+except ImportError:
+    ahocorasick = None
+
 
 logger = logging.getLogger(__name__)
 
@@ -67,14 +76,14 @@ WATCHLIST_APPLICANTS = [
     "mistral ai",
     "mistral",
     "samsung",
-    "LG"
-    "Sony"
-    "Amdocs"
-    "Netflix"
-    "Comcast"
-    "Cujo"
-    "Leonardo"
-    "British Telecom"
+    "LG Electronics",
+    "Sony",
+    "Amdocs",
+    "Netflix",
+    "Comcast",
+    "Cujo",
+    "Leonardo",
+    "British Telecom",
 ]
 
 
@@ -84,11 +93,53 @@ def _norm(s: str) -> str:
     return " ".join(s.lower().split())
 
 
-def _matches_topic_keywords(text: str) -> bool:
-    if not text:
+def _build_matcher(keywords: List[str]):
+    """
+    Compila una lista di keyword in un unico matcher "contiene almeno una keyword?".
+
+    Con pyahocorasick usa un automa Aho-Corasick (una sola passata sul testo),
+    altrimenti ripiega su una regex in alternanza compilata una volta sola.
+    Il testo passato al matcher deve essere già lowercase.
+
+    Visto che serve solo sapere se c'è ALMENO un match, le keyword che ne
+    contengono un'altra (es. "neural network accelerator" ⊃ "neural network")
+    sono ridondanti e vengono scartate: automa / regex più piccoli.
+    """
+    words = []
+    for w in sorted({k.lower() for k in keywords if k}, key=len):
+        if not any(short in w for short in words):
+            words.append(w)
+
+    # lista vuota: nessun match (un automa vuoto non è utilizzabile e la
+    # regex "" matcherebbe qualsiasi testo)
+    if not words:
+        return lambda text: False
+
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for w in words:
+            automaton.add_word(w, w)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None) is not None
+
+    rx = re.compile("|".join(map(re.escape, words)))
+    return lambda text: rx.search(text) is not None
+
+
+_TOPIC_MATCHER = _build_matcher(TOPIC_KEYWORDS)
+
+# watchlist normalizzata una volta sola all'import
+_NORM_WATCH = tuple(w for w in (_norm(x) for x in WATCHLIST_APPLICANTS) if w)
+_WATCH_MATCHER = _build_matcher(list(_NORM_WATCH))
+
+
+def _matches_topic_keywords(text_lc: str) -> bool:
+    """
+    text_lc deve essere già lowercase (lo prepara _enrich_tags una volta sola).
+    """
+    if not text_lc:
         return False
-    t = text.lower()
-    return any(k in t for k in TOPIC_KEYWORDS)
+    return _TOPIC_MATCHER(text_lc)
 
 
 def _matches_watchlist_applicant(pat: Dict[str, Any]) -> bool:
@@ -111,22 +162,21 @@ def _matches_watchlist_applicant(pat: Dict[str, Any]) -> bool:
     if not names:
         return False
 
-    norm_watch = [ _norm(w) for w in WATCHLIST_APPLICANTS ]
-
-    for raw in names:
-        n = _norm(raw)
-        if not n:
-            continue
-        for w in norm_watch:
-            if w and w in n:
-                return True
-    return False
+    # un'unica scansione su tutti i nomi; il separatore " | " evita
+    # match "a cavallo" tra due nomi diversi
+    blob = " | ".join(_norm(raw) for raw in names)
+    return _WATCH_MATCHER(blob)
 
 
 # -------------------------------
 #  FETCHERS (EPO / USPTO) – ESEMPI
 # -------------------------------
 
+# Margine di over-fetch rispetto a max_items: una parte dei brevetti viene
+# scartata dal filtro topic/watchlist, ma non serve scaricarne il doppio.
+_FETCH_MARGIN = 10
+
+
 def _fetch_epo_patents(publication_date: str, max_items: int = 50) -> List[Dict]:
     """
     Placeholder per fetch da EPO (Open Patent Services).
@@ -145,7 +195,8 @@ def _fetch_epo_patents(publication_date: str, max_items: int = 50) -> List[Dict]
     """
     logger.info("[PATENTS][EPO] Fetching patents for date=%s", publication_date)
 
-    # QUI devi integrare la tua logica reale verso OPS / EPO.
+    # QUI devi integrare la tua logica reale verso OPS / EPO,
+    # limitando i risultati lato server (header Range "1-{max_items}" di OPS).
     # Per ora mettiamo uno stub vuoto.
     results: List[Dict] = []
 
@@ -176,7 +227,8 @@ def _fetch_uspto_patents(publication_date: str, max_items: int = 50) -> List[Dic
     """
     logger.info("[PATENTS][USPTO] Fetching patents for date=%s", publication_date)
 
-    # Anche qui: integra la tua logica reale verso l'API USPTO che preferisci.
+    # Anche qui: integra la tua logica reale verso l'API USPTO che preferisci,
+    # passando max_items come limite lato server.
     results: List[Dict] = []
 
     # Esempio fittizio:
@@ -205,26 +257,25 @@ def _enrich_tags(pat: Dict[str, Any]) -> None:
     """
     - Aggiunge tag 'topic-compute-video-data-cloud' se matcha le keyword.
     - Aggiunge tag 'watchlist-applicant' se appartiene alla watchlist.
+
+    Salva anche l'esito dei due match in pat["_topic_match"] / pat["_wl_match"],
+    così il collector può filtrare senza rifare la scansione.
     """
     tags = list(pat.get("tags") or [])
-    text = " ".join(
-        [
-            pat.get("title") or "",
-            pat.get("abstract") or "",
-        ]
-    )
-    if _matches_topic_keywords(text):
+    text_lc = ((pat.get("title") or "") + " " + (pat.get("abstract") or "")).lower()
+    topic_match = _matches_topic_keywords(text_lc)
+    watchlist_match = _matches_watchlist_applicant(pat)
+    pat["_topic_match"] = topic_match
+    pat["_wl_match"] = watchlist_match
+
+    if topic_match:
         tags.append("topic-compute-video-data-cloud")
 
-    if _matches_watchlist_applicant(pat):
+    if watchlist_match:
         tags.append("watchlist-applicant")
 
-    # de-duplicate
-    dedup = []
-    for t in tags:
-        if t and t not in dedup:
-            dedup.append(t)
-    pat["tags"] = dedup
+    # de-duplicate (mantenendo l'ordine)
+    pat["tags"] = list(dict.fromkeys(t for t in tags if t))
 
 
 def collect_patent_publications(
@@ -254,8 +305,11 @@ def collect_patent_publications(
 
     logger.info("[PATENTS] Collecting publications for previous day: %s", prev_str)
 
-    epo = _fetch_epo_patents(prev_str, max_items=max_items * 2)
-    us = _fetch_uspto_patents(prev_str, max_items=max_items * 2)
+    # EPO e USPTO sono chiamate di rete indipendenti: le lanciamo in parallelo.
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        f_epo = ex.submit(_fetch_epo_patents, prev_str, max_items=max_items + _FETCH_MARGIN)
+        f_us = ex.submit(_fetch_uspto_patents, prev_str, max_items=max_items + _FETCH_MARGIN)
+        epo, us = f_epo.result(), f_us.result()
 
     all_raw: List[Dict] = epo + us
     logger.info("[PATENTS] Raw collected: EPO=%d, US=%d", len(epo), len(us))
@@ -266,15 +320,9 @@ def collect_patent_publications(
         # Enrich tags based on title/abstract + watchlist
         _enrich_tags(pat)
 
-        text = " ".join(
-            [
-                pat.get("title") or "",
-                pat.get("abstract") or "",
-            ]
-        )
-
-        topic_match = _matches_topic_keywords(text)
-        watchlist_match = _matches_watchlist_applicant(pat)
+        # riusa i match calcolati da _enrich_tags (e toglie le chiavi di servizio)
+        topic_match = pat.pop("_topic_match")
+        watchlist_match = pat.pop("_wl_match")
 
         # FILTRO PRINCIPALE:
         # - tieni se è on-topic
@@ -287,26 +335,23 @@ def collect_patent_publications(
         pat.setdefault("office", "UNKNOWN")
         pat.setdefault("publication_number", "")
         pat.setdefault("title", "")
-        pat.setdefault("publication_date", prev_str)
+        if not pat.get("publication_date"):
+            pat["publication_date"] = prev_str
         pat.setdefault("applicants", [])
         pat.setdefault("assignee", "")
         pat.setdefault("source_url", "")
 
         filtered.append(pat)
 
-    # Ordiniamo: prima per data (disc), poi per office, poi per pub number
-    def _sort_key(p: Dict[str, Any]):
-        d_str = p.get("publication_date") or prev_str
-        try:
-            d = datetime.strptime(d_str, "%Y-%m-%d").date()
-        except Exception:
-            d = prev_day
-        return (d, p.get("office", ""), p.get("publication_number", ""))
-
-    filtered_sorted = sorted(filtered, key=_sort_key, reverse=True)
-
-    if len(filtered_sorted) > max_items:
-        filtered_sorted = filtered_sorted[:max_items]
+    # Ordiniamo: prima per data (disc), poi per office, poi per pub number.
+    # Le date sono stringhe ISO 'YYYY-MM-DD': l'ordine lessicografico coincide
+    # con quello cronologico, quindi niente strptime.
+    # Teniamo solo i primi max_items: nlargest evita il sort completo.
+    filtered_sorted = heapq.nlargest(
+        max_items,
+        filtered,
+        key=itemgetter("publication_date", "office", "publication_number"),
+    )
 
     logger.info("[PATENTS] Filtered relevant publications: %d", len(filtered_sorted))
     return filtered_sorted
@@ -2,22 +2,68 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from html import escape
-from typing import List, Dict, Any
+import re
+from operator import itemgetter
+import os
+from typing import Iterator, List, Dict, Any
+
+
+# escape con cache per i campi a bassa cardinalità (source, topic) che si
+# ripetono su molti articoli dello stesso report
+_escape_cached = lru_cache(maxsize=256)(escape)
+
+
+def _esc(s: str | None) -> str:
+    """
+    escape() solo se il campo è valorizzato: i campi vuoti / None tornano "".
+    """
+    return escape(s) if s else ""
+
+
+def _esc_text(s: str | None) -> str:
+    """
+    Come _esc, ma per il contenuto testuale tra i tag (mai dentro un
+    attributo "..."): le virgolette non vanno escapate, quote=False
+    risparmia due replace dentro html.escape.
+    """
+    return escape(s, quote=False) if s else ""
+
+
+# variante con cache di _esc_text per i campi testuali che si ripetono tra
+# le righe (nomi CEO, aziende, office, date, assignee); titoli, quote,
+# abstract e la lista applicants sono quasi sempre unici e restano fuori
+_esc_text_cached = lru_cache(maxsize=256)(_esc_text)
+
+
+def _clip(s: str, limit: int) -> str:
+    """
+    strip() + tronca a `limit` caratteri (ellissi compresa).
+    Nota: str.strip() restituisce lo stesso oggetto se non c'è nulla da
+    togliere, quindi sui testi già puliti non alloca.
+    """
+    s = s.strip()
+    if len(s) > limit:
+        return s[:limit - 3] + "…"
+    return s
 
 
 # -------------------------------------------------------
 # HEADER + STORICO 7 GIORNI + PULSANTE WEEKLY
 # -------------------------------------------------------
 
-def _render_header(date_str: str) -> str:
-    return f"""
+# Markup statico dell'header: l'unica parte variabile è la data, che viene
+# inserita tra _HEADER_OPEN e _HEADER_CLOSE (niente f-string da ricostruire)
+_HEADER_OPEN = """
 <header style="margin-bottom: 24px;">
   <h1 style="margin:0; font-size:26px;">MaxBits · Daily Tech Watch</h1>
   <p style="margin:2px 0 0 0; color:#666; font-size:13px;">
     High-quality technology news from around the world.
   </p>
-  <p style="margin:4px 0 0 0; color:#555;">Daily brief · {escape(date_str)}</p>
+  <p style="margin:4px 0 0 0; color:#555;">Daily brief · """
+
+_HEADER_CLOSE = """</p>
 
   <div style="margin-top:10px; display:flex; gap:8px; flex-wrap:wrap;">
     <button id="open-weekly-btn"
@@ -34,47 +80,79 @@ def _render_header(date_str: str) -> str:
     <strong style="font-size:13px;">Last 7 daily reports</strong>
     <ul id="history-list"
         style="margin:6px 0 0 16px; padding:0; font-size:12px; color:#333;">
+"""
+
+_HEADER_END = """
     </ul>
   </section>
 </header>
 """
 
+_HISTORY_EMPTY = "<li>reports available on the left column.</li>"
+
+
+def _render_history(out: List[str], history: List[Dict[str, str]] | None) -> None:
+    """
+    Righe <li> dello storico (max 7), generate qui invece che via JS al load
+    della pagina. history: lista di dict con chiavi date / html / pdf.
+    """
+    if not history:
+        out.append(_HISTORY_EMPTY)
+        return
+
+    for it in history[:7]:
+        date = _esc_text(it.get("date"))
+        html_url = _esc(it.get("html"))
+        pdf_url = _esc(it.get("pdf"))
+
+        links = []
+        if html_url:
+            links.append(f'<a href="{html_url}" target="_blank" rel="noopener">HTML</a>')
+        if pdf_url:
+            links.append(f'<a href="{pdf_url}" target="_blank" rel="noopener">PDF</a>')
+
+        # il separatore " – " solo se c'è almeno un link
+        if links:
+            out.append(f"<li><strong>{date}</strong> – {' · '.join(links)}</li>")
+        else:
+            out.append(f"<li><strong>{date}</strong></li>")
+
 
 # -------------------------------------------------------
 # DEEP DIVES
 # -------------------------------------------------------
 
-def _render_deep_dives(deep_dives: List[Dict]) -> str:
+def _render_deep_dives(out: List[str], deep_dives: List[Dict]) -> None:
     if not deep_dives:
-        return "<p>No deep-dives today.</p>"
-
-    blocks = []
+        out.append("<p>No deep-dives today.</p>")
+        return
 
     for idx, item in enumerate(deep_dives):
         art_id = escape(item.get("id") or f"deep_{idx+1}")
-        title = escape(item.get("title", ""))
-        url = item.get("url") or "#"
-        source = escape(item.get("source", ""))
-        topic = escape(item.get("topic", "General"))
-
-        block = f"""
-<article style="margin-bottom:24px; padding-bottom:16px; border-bottom:1px solid #eee;">
-  <h2 style="margin:0 0 4px 0; font-size:20px;">
-    <a href="{url}" style="color:#0052CC; text-decoration:none;">{title}</a>
+        title = _esc(item.get("title"))
+        # url finisce in href e data-url: escape una volta sola
+        url = _esc(item.get("url")) or "#"
+        source = _escape_cached(item.get("source") or "")
+        topic = _escape_cached(item.get("topic") or "General")
+
+        out.append(f"""
+<article class="dd">
+  <h2>
+    <a href="{url}" class="lnk">{title}</a>
   </h2>
-  <p style="margin:0; color:#777; font-size:13px;">
+  <p class="dd-meta">
     {source} · Topic: <strong>{topic}</strong>
   </p>
 
-  <ul style="margin:10px 0 0 20px; padding:0; font-size:14px;">
-    <li><strong>What it is:</strong> {escape(item.get("what_it_is",""))}</li>
-    <li><strong>Who:</strong> {escape(item.get("who",""))}</li>
-    <li><strong>What it does:</strong> {escape(item.get("what_it_does",""))}</li>
-    <li><strong>Why it matters:</strong> {escape(item.get("why_it_matters",""))}</li>
-    <li><strong>Strategic view:</strong> {escape(item.get("strategic_view",""))}</li>
+  <ul class="dd-points">
+    <li><strong>What it is:</strong> {_esc_text(item.get("what_it_is"))}</li>
+    <li><strong>Who:</strong> {_esc_text(item.get("who"))}</li>
+    <li><strong>What it does:</strong> {_esc_text(item.get("what_it_does"))}</li>
+    <li><strong>Why it matters:</strong> {_esc_text(item.get("why_it_matters"))}</li>
+    <li><strong>Strategic view:</strong> {_esc_text(item.get("strategic_view"))}</li>
   </ul>
 
-  <label style="margin-top:10px; display:inline-flex; gap:6px; font-size:13px; color:#333;">
+  <label class="dd-weekly">
     <input type="checkbox"
            class="weekly-checkbox"
            data-id="{art_id}"
@@ -84,146 +162,150 @@ def _render_deep_dives(deep_dives: List[Dict]) -> str:
     Add to Weekly
   </label>
 </article>
-"""
-        blocks.append(block)
-
-    return "\n".join(blocks)
+""")
 
 
 # -------------------------------------------------------
 # CEO POV SECTION
 # -------------------------------------------------------
 
-def _render_ceo_pov(ceo_items: List[Dict[str, Any]]) -> str:
+_CEO_FIELDS = (
+    "ceo_name",
+    "company",
+    "role",
+    "topic",
+    "quote",
+    "source",
+    "url",
+    "date",
+)
+
+
+def _render_ceo_pov(out: List[str], ceo_items: List[Dict[str, Any]]) -> None:
     """
     Mostra le dichiarazioni dei CEO su AI / Space / Tech in modo compatto ma leggibile.
     """
     if not ceo_items:
-        return """
+        out.append("""
 <section style="margin-top:30px;">
   <h2 style="margin:0 0 8px 0; font-size:20px;">CEO POV · AI &amp; Space Economy</h2>
   <p style="margin:4px 0 0 0; font-size:13px; color:#777;">
     No CEO statements collected for today.
   </p>
 </section>
-"""
+""")
+        return
 
-    blocks: List[str] = []
+    out.append("""
+<section style="margin-top:30px;">
+  <h2 style="margin:0 0 8px 0; font-size:20px;">CEO POV · AI &amp; Space Economy</h2>
+  <p style="margin:2px 0 10px 0; font-size:13px; color:#777;">
+    Selected statements from top tech and space CEOs about AI, cloud and orbital infrastructure.
+  </p>
+  """)
 
     for idx, item in enumerate(ceo_items):
         cid = escape(str(item.get("id") or f"ceo_{idx+1}"))
 
-        name = (
-            item.get("ceo_name")
-            or item.get("name")
-            or item.get("person")
-            or "Unnamed executive"
+        name, company, role, topic, quote, source, url, date = map(
+            item.get, _CEO_FIELDS
         )
-        company = item.get("company") or ""
-        role = item.get("role") or ""
-        topic = item.get("topic") or ""
-        quote = item.get("quote") or ""
-        source = item.get("source") or ""
-        url = item.get("url") or ""
-        date = item.get("date") or ""
-
-        name_html = escape(name)
-        company_html = escape(company)
-        role_html = escape(role)
-        topic_html = escape(topic or "Tech / Strategy")
-        source_html = escape(source)
-        date_html = escape(date)
+        name = name or item.get("name") or item.get("person") or "Unnamed executive"
+
+        name_html = _esc_text_cached(name)
+        company_html = _esc_text_cached(company)
+        role_html = _esc_text_cached(role)
+        topic_html = _esc_text_cached(topic) or "Tech / Strategy"
+        source_html = _esc_text_cached(source)
+        date_html = _esc_text_cached(date)
+        url = _esc(url)
 
         # se quote è lunga, accorcia a ~260 char
-        q = quote.strip()
-        if len(q) > 260:
-            q = q[:257] + "…"
-        quote_html = escape(q)
-
-        meta_parts = []
-        if company_html:
-            meta_parts.append(company_html)
-        if role_html:
-            meta_parts.append(role_html)
-        if date_html:
-            meta_parts.append(date_html)
-        meta_str = " · ".join(meta_parts)
+        quote_html = _esc_text(_clip(quote, 260)) if quote else ""
+
+        meta_str = " · ".join(filter(None, (company_html, role_html, date_html)))
 
         link_html = ""
         if url:
-            link_html = f"""<a href="{url}" target="_blank" rel="noopener"
-                             style="font-size:12px; color:#0052CC; text-decoration:none;">
+            link_html = f"""<a href="{url}" target="_blank" rel="noopener" class="lnk ceo-link">
                              Source</a>"""
 
-        blocks.append(f"""
-<article id="{cid}"
-         style="margin-bottom:14px; padding:10px 12px;
-                border-radius:8px; background:#f9fafb; border:1px solid #e5e7eb;">
-  <div style="display:flex; justify-content:space-between; align-items:flex-start; gap:8px;">
-    <div style="flex:1;">
-      <p style="margin:0; font-size:13px; color:#374151;">
-        <span style="font-weight:600;">{name_html}</span>
-        <span style="color:#6b7280;"> — {meta_str}</span>
+        out.append(f"""
+<article id="{cid}" class="ceo">
+  <div class="ceo-head">
+    <div class="ceo-body">
+      <p class="ceo-who">
+        <span class="ceo-name">{name_html}</span>
+        <span class="ceo-meta"> — {meta_str}</span>
       </p>
-      <p style="margin:6px 0 0 0; font-size:13px; color:#111827;">
+      <p class="ceo-quote">
         “{quote_html}”
       </p>
     </div>
-    <div style="padding-left:8px; text-align:right;">
-      <span style="display:inline-block; padding:2px 8px; border-radius:999px;
-                   background:#e0f2fe; color:#0369a1; font-size:11px;">
+    <div class="ceo-side">
+      <span class="pill ceo-topic">
         {topic_html}
       </span>
     </div>
   </div>
-  <div style="margin-top:6px; display:flex; justify-content:space-between; align-items:center;">
-    <span style="font-size:11px; color:#6b7280;">{source_html}</span>
+  <div class="ceo-foot">
+    <span class="ceo-source">{source_html}</span>
     {link_html}
   </div>
 </article>
 """)
 
-    return f"""
-<section style="margin-top:30px;">
-  <h2 style="margin:0 0 8px 0; font-size:20px;">CEO POV · AI &amp; Space Economy</h2>
-  <p style="margin:2px 0 10px 0; font-size:13px; color:#777;">
-    Selected statements from top tech and space CEOs about AI, cloud and orbital infrastructure.
-  </p>
-  {''.join(blocks)}
+    out.append("""
 </section>
-"""
+""")
 
 
 # -------------------------------------------------------
 # PATENT WATCH SECTION (COMPUTE / VIDEO / DATA / CLOUD)
 # -------------------------------------------------------
 
+# Keyword per area, in ordine di priorità (costruite una volta sola all'import)
+_AREA_KEYWORDS = (
+    ("Video", ("codec", "encoding", "decoding", "transcoding", "video", "streaming", "abr", "av1", "hevc", "vvc", "h.264", "h.265")),
+    ("Data", ("database", "data lake", "data warehouse", "analytics", "big data", "olap", "oltp", "data pipeline", "data processing")),
+    ("Cloud", ("cloud", "saas", "paas", "iaas", "kubernetes", "serverless", "object storage", "block storage", "edge computing")),
+    ("Compute", ("gpu", "accelerator", "cpu", "processor", "asic", "inference", "neural network accelerator", "compute", "computing", "tensor core")),
+)
+
+
 def _patent_area(pat: Dict[str, Any]) -> str:
     """
     Classifica un brevetto in una macro area: Compute, Cloud, Video, Data, Other.
     Usa title+abstract in modo euristico.
     """
-    text = " ".join(
-        [
-            str(pat.get("title") or ""),
-            str(pat.get("abstract") or ""),
-        ]
-    ).lower()
+    title = pat.get("title") or ""
+    abstract = pat.get("abstract") or ""
+    if not (title or abstract):
+        return "Other"
+    text = (title + " " + abstract).lower()
 
     # Semplici euristiche (ordine di priorità)
-    if any(k in text for k in ["codec", "encoding", "decoding", "transcoding", "video", "streaming", "abr", "av1", "hevc", "vvc", "h.264", "h.265"]):
-        return "Video"
+    # loop esplicito invece di any(generatore): esce al primo match
+    # senza creare un generatore per area
+    for area, keywords in _AREA_KEYWORDS:
+        for k in keywords:
+            if k in text:
+                return area
 
-    if any(k in text for k in ["database", "data lake", "data warehouse", "analytics", "big data", "olap", "oltp", "data pipeline", "data processing"]):
-        return "Data"
+    return "Other"
 
-    if any(k in text for k in ["cloud", "saas", "paas", "iaas", "kubernetes", "serverless", "object storage", "block storage", "edge computing"]):
-        return "Cloud"
 
-    if any(k in text for k in ["gpu", "accelerator", "cpu", "processor", "asic", "inference", "neural network accelerator", "compute", "computing", "tensor core"]):
-        return "Compute"
+# colori (background, foreground) della badge per area
+_AREA_COLORS = {
+    "Compute": ("#dbeafe", "#1d4ed8"),   # light indigo
+    "Cloud": ("#e0f2fe", "#0369a1"),     # light sky
+    "Video": ("#ccfbf1", "#0f766e"),     # teal
+    "Data": ("#fef3c7", "#b45309"),      # amber
+}
+_AREA_COLORS_DEFAULT = ("#e5e7eb", "#374151")
 
-    return "Other"
+# ordine di visualizzazione delle aree nella Patent watch
+_AREA_IDX = {"Compute": 0, "Cloud": 1, "Video": 2, "Data": 3, "Other": 4}
 
 
 def _patent_area_badge(area: str) -> str:
@@ -233,131 +315,123 @@ def _patent_area_badge(area: str) -> str:
     area = area or "Other"
     label = area
 
-    bg = "#e5e7eb"
-    fg = "#374151"
-
-    if area == "Compute":
-        bg, fg = "#dbeafe", "#1d4ed8"   # light indigo
-    elif area == "Cloud":
-        bg, fg = "#e0f2fe", "#0369a1"   # light sky
-    elif area == "Video":
-        bg, fg = "#ccfbf1", "#0f766e"   # teal
-    elif area == "Data":
-        bg, fg = "#fef3c7", "#b45309"   # amber
+    # colori per area: classi .area-<nome> generate in _STYLESHEET
+    css_class = "area-" + area.lower() if area in _AREA_COLORS else "area-other"
 
     return f"""
-<span style="display:inline-block; padding:2px 8px; border-radius:999px;
-             background:{bg}; color:{fg}; font-size:11px; font-weight:500;">
+<span class="pill area {css_class}">
   {escape(label)}
 </span>
 """
 
 
-def _render_patent_watch(patents: List[Dict[str, Any]]) -> str:
+# le aree sono un insieme chiuso: badge calcolate una volta sola all'import
+_AREA_BADGES = {area: _patent_area_badge(area) for area in _AREA_IDX}
+
+
+_PATENT_FIELDS = (
+    "title",
+    "source_url",
+    "office",
+    "publication_number",
+    "publication_date",
+    "applicants",
+    "assignee",
+    "abstract",
+)
+
+
+def _render_patent_watch(out: List[str], patents: List[Dict[str, Any]]) -> None:
     if not patents:
-        return """
+        out.append("""
 <section style="margin-top:30px;">
   <h2 style="margin:0 0 8px 0; font-size:20px;">Patent watch · Compute / Video / Data / Cloud</h2>
   <p style="margin:4px 0 0 0; font-size:13px; color:#777;">
     No relevant patent publications detected for today (EPO / USPTO).
   </p>
 </section>
-"""
+""")
+        return
 
-    # arricchisci ogni patente con area
+    # arricchisci ogni patente con area: (indice area, data, area, patent)
     enriched = []
     for p in patents:
         area = _patent_area(p)
-        enriched.append((area, p))
-
-    # ordina per area poi per data
-    def _sort_key(item):
-        area, p = item
-        date_str = p.get("publication_date") or ""
-        return (area, date_str)
-
-    enriched.sort(key=_sort_key, reverse=True)
-
-    rows: List[str] = []
-    for area, p in enriched:
-        badge = _patent_area_badge(area)
-
-        title = escape(p.get("title") or "Untitled patent")
-        url = p.get("source_url") or ""
-        office = escape(p.get("office") or "")
-        pubno = escape(p.get("publication_number") or "")
-        date = escape(p.get("publication_date") or "")
-        applicants = p.get("applicants") or []
+        enriched.append((_AREA_IDX[area], p.get("publication_date") or "", area, p))
+
+    # ordina per area (Compute, Cloud, Video, Data, Other) poi per data (desc).
+    # Due sort stabili con chiavi itemgetter: nessuna callback Python e,
+    # a parità di area/data, resta l'ordine in ingresso.
+    enriched.sort(key=itemgetter(1), reverse=True)
+    enriched.sort(key=itemgetter(0))
+
+    out.append("""
+<section style="margin-top:30px;">
+  <h2 style="margin:0 0 8px 0; font-size:20px;">Patent watch · Compute / Video / Data / Cloud</h2>
+  <p style="margin:2px 0 6px 0; font-size:13px; color:#777;">
+    Selected patent publications from EPO / USPTO relevant to computation, video, data platforms and cloud infrastructure.
+  </p>
+  <table style="width:100%; border-collapse:collapse; margin-top:6px;">
+    <tbody>
+    """)
+
+    for _idx, _date, area, p in enriched:
+        badge = _AREA_BADGES[area]
+
+        title, url, office, pubno, date, applicants, assignee, abstract = map(
+            p.get, _PATENT_FIELDS
+        )
+
+        # i campi vuoti (frequenti) non passano da escape()
+        title = escape(title or "Untitled patent", quote=False)
+        url = _esc(url)
+        office = _esc_text_cached(office)
+        pubno = _esc_text(pubno)
+        date = _esc_text_cached(date)
         if isinstance(applicants, str):
             applicants_str = applicants
+        elif applicants:
+            applicants_str = ", ".join(map(str, applicants))
         else:
-            applicants_str = ", ".join(str(a) for a in applicants)
-        applicants_html = escape(applicants_str)
+            applicants_str = ""
+        applicants_html = _esc_text(applicants_str)
 
-        assignee_html = escape(p.get("assignee") or "")
-        abstract = (p.get("abstract") or "").strip()
-        if len(abstract) > 220:
-            abstract = abstract[:217] + "…"
-        abstract_html = escape(abstract)
+        assignee_html = _esc_text_cached(assignee)
+        abstract_html = _esc_text(_clip(abstract, 220)) if abstract else ""
 
         if url:
-            title_html = f'<a href="{url}" target="_blank" rel="noopener" style="color:#0052CC; text-decoration:none;">{title}</a>'
+            title_html = f'<a href="{url}" target="_blank" rel="noopener" class="lnk">{title}</a>'
         else:
             title_html = title
 
-        meta_line_parts = []
-        if office:
-            meta_line_parts.append(office)
-        if pubno:
-            meta_line_parts.append(pubno)
-        if date:
-            meta_line_parts.append(date)
-        meta_line = " · ".join(meta_line_parts)
-
-        applicant_line_parts = []
-        if applicants_html:
-            applicant_line_parts.append(applicants_html)
-        if assignee_html:
-            applicant_line_parts.append(assignee_html)
-        applicant_line = " — ".join(applicant_line_parts)
-
-        rows.append(f"""
-<tr style="border-bottom:1px solid #f3f4f6;">
-  <td style="vertical-align:top; padding:8px 8px 8px 0; width:110px;">
+        meta_line = " · ".join(filter(None, (office, pubno, date)))
+        applicant_line = " — ".join(filter(None, (applicants_html, assignee_html)))
+
+        out.append(f"""
+<tr class="pt">
+  <td class="pt-side">
     {badge}
-    <div style="margin-top:4px; font-size:11px; color:#6b7280;">{meta_line}</div>
+    <div class="pt-meta">{meta_line}</div>
   </td>
-  <td style="vertical-align:top; padding:8px 0 8px 0;">
-    <div style="font-size:13px; font-weight:600; margin-bottom:2px;">
+  <td class="pt-main">
+    <div class="pt-title">
       {title_html}
     </div>
-    <div style="font-size:12px; color:#6b7280; margin-bottom:4px;">
+    <div class="pt-who">
       {applicant_line}
     </div>
-    <div style="font-size:12px; color:#374151;">
+    <div class="pt-abstract">
       {abstract_html}
     </div>
   </td>
 </tr>
 """)
 
-    table_html = f"""
-<table style="width:100%; border-collapse:collapse; margin-top:6px;">
-  <tbody>
-    {''.join(rows)}
-  </tbody>
-</table>
-"""
-
-    return f"""
-<section style="margin-top:30px;">
-  <h2 style="margin:0 0 8px 0; font-size:20px;">Patent watch · Compute / Video / Data / Cloud</h2>
-  <p style="margin:2px 0 6px 0; font-size:13px; color:#777;">
-    Selected patent publications from EPO / USPTO relevant to computation, video, data platforms and cloud infrastructure.
-  </p>
-  {table_html}
+    out.append("""
+    </tbody>
+  </table>
 </section>
-"""
+""")
 
 
 # -------------------------------------------------------
@@ -376,56 +450,65 @@ WATCHLIST_TOPICS_ORDER = [
 ]
 
 
+_PRETTY_TOPIC_NAMES = {
+    "Space/Infra": "Space / Infrastructure",
+    "AI/Cloud/Quantum": "AI / Cloud / Quantum",
+    "Telco/5G": "Telco / 5G",
+    "Media/Platforms": "Media / Platforms",
+    "Robotics/Automation": "Robotics / Automation",
+    "Broadcast/Video": "Broadcast / Video",
+    "Satellite/Satcom": "Satellite / Satcom",
+    "TV/Streaming": "TV / Streaming",
+}
+
+
 def _pretty_topic_name(topic: str) -> str:
-    if topic == "Space/Infra":
-        return "Space / Infrastructure"
-    if topic == "AI/Cloud/Quantum":
-        return "AI / Cloud / Quantum"
-    if topic == "Telco/5G":
-        return "Telco / 5G"
-    if topic == "Media/Platforms":
-        return "Media / Platforms"
-    if topic == "Robotics/Automation":
-        return "Robotics / Automation"
-    if topic == "Broadcast/Video":
-        return "Broadcast / Video"
-    if topic == "Satellite/Satcom":
-        return "Satellite / Satcom"
-    if topic == "TV/Streaming":
-        return "TV / Streaming"
-    return topic.replace("/", " / ")
-
-
-def _render_watchlist_section(topic: str, items: List[Dict]) -> str:
+    return _PRETTY_TOPIC_NAMES.get(topic) or topic.replace("/", " / ")
+
+
+# titoli di sezione già escaped: l'insieme dei topic è statico
+_WATCHLIST_TITLES = {
+    topic: escape(_pretty_topic_name(topic)) for topic in WATCHLIST_TOPICS_ORDER
+}
+
+
+def _render_watchlist_section(
+    out: List[str], topic: str, title: str, items: List[Dict]
+) -> None:
     """
+    title: nome del topic già "pretty" ed escaped (vedi _WATCHLIST_TITLES).
+
     Se items è vuoto, mostra comunque la sezione con il messaggio:
     "No notable articles for this topic today."
     """
-    title = escape(_pretty_topic_name(topic))
-
     if not items:
-        return f"""
-<section style="margin-top:18px;">
-  <h3 style="margin:0 0 4px 0; font-size:16px;">{title}</h3>
-  <p style="margin:2px 0 0 0; font-size:13px; color:#777;">
+        out.append(f"""
+<section class="wl">
+  <h3 class="wl-empty-title">{title}</h3>
+  <p class="wl-empty">
     No notable articles for this topic today.
   </p>
 </section>
-"""
+""")
+        return
 
-    rows = []
+    out.append(f"""
+<section class="wl">
+  <h3>{title}</h3>
+  <ul>
+    """)
     for i, art in enumerate(items):
         aid = escape(art.get("id") or f"wl_{topic}_{i}")
-        t = escape(art.get("title",""))
-        u = art.get("url") or "#"
-        s = escape(art.get("source",""))
+        t = _esc(art.get("title"))
+        u = _esc(art.get("url")) or "#"
+        s = _escape_cached(art.get("source") or "")
 
-        rows.append(f"""
-<li style="margin-bottom:4px;">
-  <a href="{u}" style="color:#0052CC; text-decoration:none;">{t}</a>
-  <span style="color:#777; font-size:12px;">({s})</span>
+        out.append(f"""
+<li>
+  <a href="{u}" class="lnk">{t}</a>
+  <span class="wl-source">({s})</span>
 
-  <label style="margin-left:8px; font-size:12px;">
+  <label class="wl-weekly">
     <input type="checkbox"
            class="weekly-checkbox"
            data-id="{aid}"
@@ -436,62 +519,132 @@ def _render_watchlist_section(topic: str, items: List[Dict]) -> str:
   </label>
 </li>
 """)
-
-    return f"""
-<section style="margin-top:18px;">
-  <h3 style="margin:0 0 6px 0; font-size:16px;">{title}</h3>
-  <ul style="margin:0 0 0 18px; font-size:14px; padding:0; list-style:disc;">
-    {''.join(rows)}
+    out.append("""
   </ul>
 </section>
-"""
+""")
+
+
+def _render_to_str(render, *args) -> str:
+    buf: List[str] = []
+    render(buf, *args)
+    return "".join(buf)
+
+
+# sezioni "vuote" per topic: non dipendono dal report, le calcoliamo una volta
+_EMPTY_WATCHLIST_SECTIONS = {
+    topic: _render_to_str(_render_watchlist_section, topic, title, [])
+    for topic, title in _WATCHLIST_TITLES.items()
+}
+# watchlist del tutto vuota: tutte le sezioni "vuote" in un'unica stringa
+_EMPTY_WATCHLIST_HTML = "".join(_EMPTY_WATCHLIST_SECTIONS.values())
+
+# (topic, titolo escaped, sezione vuota) nell'ordine di WATCHLIST_TOPICS_ORDER:
+# il render scorre una tupla invece di fare due lookup per topic
+_WATCHLIST_LAYOUT = tuple(
+    (topic, _WATCHLIST_TITLES[topic], _EMPTY_WATCHLIST_SECTIONS[topic])
+    for topic in WATCHLIST_TOPICS_ORDER
+)
 
 
-def _render_watchlist(watchlist: Dict[str, List[Dict]]) -> str:
+def _render_watchlist(out: List[str], watchlist: Dict[str, List[Dict]]) -> None:
     """
     Mostra SEMPRE tutte le categorie in WATCHLIST_TOPICS_ORDER.
     Se una categoria non ha articoli, mostra un messaggio esplicito.
     """
-    sections = []
-    for topic in WATCHLIST_TOPICS_ORDER:
-        items = watchlist.get(topic, []) or []
-        sections.append(_render_watchlist_section(topic, items))
-
-    return "\n".join(sections)
+    if not any(map(watchlist.get, WATCHLIST_TOPICS_ORDER)):
+        out.append(_EMPTY_WATCHLIST_HTML)
+        return
+
+    for topic, title, empty_html in _WATCHLIST_LAYOUT:
+        items = watchlist.get(topic)
+        if items:
+            _render_watchlist_section(out, topic, title, items)
+        else:
+            out.append(empty_html)
 
 
 # -------------------------------------------------------
 # HTML GENERATION
 # -------------------------------------------------------
 
-def build_html_report(
-    *,
-    deep_dives,
-    watchlist,
-    date_str: str,
-    ceo_pov: List[Dict[str, Any]] | None = None,
-    patents: List[Dict[str, Any]] | None = None,
-) -> str:
-    """
-    Genera l'HTML del daily report.
+# Indentazione dei template: un a-capo seguito da spazi / righe vuote vale,
+# sia in HTML sia nel JS inline (l'a-capo resta), quanto un a-capo semplice.
+# Nel report non ci sono <pre> / <textarea> dove gli spazi contano.
+# Solo spazi ASCII: il \s Unicode toglierebbe anche NBSP & co. dai testi
+# degli articoli (titoli, quote, abstract, data-title).
+_INDENT_RE = re.compile(r"\n[ \t\r\n]+")
 
-    Parametri nuovi (opzionali, backward compatible):
-      - ceo_pov: lista di dict con dichiarazioni dei CEO
-      - patents: lista di brevetti rilevanti
-    """
-    header = _render_header(date_str)
-    deep_html = _render_deep_dives(deep_dives)
-    ceo_html = _render_ceo_pov(ceo_pov or [])
-    patent_html = _render_patent_watch(patents or [])
-    wl_html = _render_watchlist(watchlist)
 
-    return f"""<!DOCTYPE html>
+def _minify_html(html: str) -> str:
+    """
+    Toglie l'indentazione e le righe vuote dall'HTML finale (~10% di byte
+    in meno su disco, nel PDF e in download) con un'unica passata regex.
+    """
+    return _INDENT_RE.sub("\n", html)
+
+
+# Stili degli elementi ripetuti (articoli, righe, badge): una sola volta nel
+# <head> invece di un attributo style="..." per ogni riga
+_STYLESHEET = """<style>
+.lnk { color:#0052CC; text-decoration:none; }
+.pill { display:inline-block; padding:2px 8px; border-radius:999px; font-size:11px; }
+
+.dd { margin-bottom:24px; padding-bottom:16px; border-bottom:1px solid #eee; }
+.dd h2 { margin:0 0 4px 0; font-size:20px; }
+.dd-meta { margin:0; color:#777; font-size:13px; }
+.dd-points { margin:10px 0 0 20px; padding:0; font-size:14px; }
+.dd-weekly { margin-top:10px; display:inline-flex; gap:6px; font-size:13px; color:#333; }
+
+.ceo { margin-bottom:14px; padding:10px 12px; border-radius:8px; background:#f9fafb; border:1px solid #e5e7eb; }
+.ceo-head { display:flex; justify-content:space-between; align-items:flex-start; gap:8px; }
+.ceo-body { flex:1; }
+.ceo-who { margin:0; font-size:13px; color:#374151; }
+.ceo-name { font-weight:600; }
+.ceo-meta { color:#6b7280; }
+.ceo-quote { margin:6px 0 0 0; font-size:13px; color:#111827; }
+.ceo-side { padding-left:8px; text-align:right; }
+.ceo-topic { background:#e0f2fe; color:#0369a1; }
+.ceo-foot { margin-top:6px; display:flex; justify-content:space-between; align-items:center; }
+.ceo-source { font-size:11px; color:#6b7280; }
+.ceo-link { font-size:12px; }
+
+.pt { border-bottom:1px solid #f3f4f6; }
+.pt-side { vertical-align:top; padding:8px 8px 8px 0; width:110px; }
+.pt-meta { margin-top:4px; font-size:11px; color:#6b7280; }
+.pt-main { vertical-align:top; padding:8px 0 8px 0; }
+.pt-title { font-size:13px; font-weight:600; margin-bottom:2px; }
+.pt-who { font-size:12px; color:#6b7280; margin-bottom:4px; }
+.pt-abstract { font-size:12px; color:#374151; }
+.area { font-weight:500; }
+""" + "".join(
+    f".area-{area.lower()} {{ background:{bg}; color:{fg}; }}\n"
+    for area, (bg, fg) in (*_AREA_COLORS.items(), ("Other", _AREA_COLORS_DEFAULT))
+) + """
+.wl { margin-top:18px; }
+.wl h3 { margin:0 0 6px 0; font-size:16px; }
+.wl h3.wl-empty-title { margin:0 0 4px 0; }
+.wl-empty { margin:2px 0 0 0; font-size:13px; color:#777; }
+.wl ul { margin:0 0 0 18px; font-size:14px; padding:0; list-style:disc; }
+.wl li { margin-bottom:4px; }
+.wl-source { color:#777; font-size:12px; }
+.wl-weekly { margin-left:8px; font-size:12px; }
+</style>"""
+
+
+# Apertura pagina: la data compare in <meta report-date> e nel <title>
+_PAGE_HEAD_OPEN = '''<!DOCTYPE html>
 <html lang="en">
 <head>
   <meta charset="utf-8" />
   <meta name="viewport" content="width=device-width, initial-scale=1" />
-  <meta name="report-date" content="{escape(date_str)}" />
-  <title>MaxBits · Daily Tech Watch · {escape(date_str)}</title>
+  <meta name="report-date" content="'''
+
+_PAGE_HEAD_TITLE = '''" />
+  <title>MaxBits · Daily Tech Watch · '''
+
+_PAGE_HEAD_CLOSE = """</title>
+""" + _STYLESHEET + """
 </head>
 
 <body style="font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Arial,sans-serif;
@@ -500,153 +653,316 @@ def build_html_report(
 <div style="max-width:900px; margin:0 auto; background:white;
             padding:24px 32px; border-radius:8px; box-shadow:0 0 12px rgba(0,0,0,0.05);">
 
-  {header}
-
-  <section style="margin-top:30px;">
-    <h2 style="margin:0 0 12px 0; font-size:22px;">3 deep-dives you should really read</h2>
-    {deep_html}
-  </section>
-
-  {ceo_html}
+  """
 
-  {patent_html}
-
-  <section style="margin-top:30px;">
-    <h2 style="margin:0 0 12px 0; font-size:20px;">Curated watchlist · 3–5 links per topic</h2>
-    {wl_html}
-  </section>
-
-</div>
-
-<script>
-(function() {{
+# Script "Weekly" (statico: nessuna interpolazione)
+_SCRIPT_HTML = """<script>
+(function() {
   const KEY = "maxbits_weekly_selections_v1";
 
-  function loadSel() {{
-    try {{
-      return JSON.parse(localStorage.getItem(KEY) || "{{}}" );
-    }} catch (e) {{
-      return {{}};
-    }}
-  }}
+  function loadSel() {
+    try {
+      return JSON.parse(localStorage.getItem(KEY) || "{}" );
+    } catch (e) {
+      return {};
+    }
+  }
 
-  function saveSel(x) {{
-    try {{
+  function saveSel(x) {
+    try {
       localStorage.setItem(KEY, JSON.stringify(x));
-    }} catch (e) {{
+    } catch (e) {
       console.warn("[Weekly] Cannot save selections", e);
-    }}
-  }}
-
-  function setupCheckboxes() {{
+    }
+  }
+
+  // selezioni di oggi tenute in memoria; localStorage viene riscritto con
+  // un piccolo debounce invece che a ogni click
+  let sel = null;
+  let saveTimer = 0;
+
+  function flushSel() {
+    if (!saveTimer) return;
+    clearTimeout(saveTimer);
+    saveTimer = 0;
+    saveSel(sel);
+  }
+
+  function scheduleSave() {
+    if (!saveTimer) saveTimer = setTimeout(flushSel, 150);
+  }
+
+  function setupCheckboxes() {
     const meta = document.querySelector("meta[name='report-date']");
     if (!meta) return;
     const date = meta.content;
 
-    const data = loadSel();
+    const data = sel = loadSel();
     const todays = data[date] || [];
 
-    document.querySelectorAll(".weekly-checkbox").forEach(cb => {{
+    const selected = new Set(todays.map(a => a.id));
+    document.querySelectorAll(".weekly-checkbox").forEach(cb => {
       const id = cb.dataset.id;
-      if (!id) return;
-
-      if (todays.some(a => a.id === id)) cb.checked = true;
-
-      cb.addEventListener("change", () => {{
-        const entry = {{
-          id: cb.dataset.id,
-          title: cb.dataset.title,
-          url: cb.dataset.url,
-          source: cb.dataset.source
-        }};
-        const arr = data[date] || [];
-        const i = arr.findIndex(a => a.id === entry.id);
-
-        if (cb.checked && i === -1) arr.push(entry);
-        if (!cb.checked && i !== -1) arr.splice(i, 1);
-
-        data[date] = arr;
-        saveSel(data);
-      }});
-    }});
-  }}
-
-  function openWeekly() {{
+      if (id && selected.has(id)) cb.checked = true;
+    });
+
+    // un solo listener delegato per tutte le checkbox
+    document.body.addEventListener("change", e => {
+      const cb = e.target;
+      if (!cb.classList || !cb.classList.contains("weekly-checkbox")) return;
+      if (!cb.dataset.id) return;
+
+      const entry = {
+        id: cb.dataset.id,
+        title: cb.dataset.title,
+        url: cb.dataset.url,
+        source: cb.dataset.source
+      };
+      const arr = data[date] || [];
+      const i = arr.findIndex(a => a.id === entry.id);
+
+      if (cb.checked && i === -1) arr.push(entry);
+      if (!cb.checked && i !== -1) arr.splice(i, 1);
+
+      data[date] = arr;
+      scheduleSave();
+    });
+
+    // salvataggio in sospeso: non va perso se la pagina viene chiusa
+    window.addEventListener("pagehide", flushSel);
+  }
+
+  function openWeekly() {
+    flushSel();
     const data = loadSel();
-    const dates = Object.keys(data).sort().reverse();
+    const dates = Object.keys(data).sort((a, b) => (a < b ? 1 : a > b ? -1 : 0));
     const win = window.open("", "_blank");
-    if (!win) {{
+    if (!win) {
       alert("Popup blocked: allow popups for this site to see the weekly view.");
       return;
-    }}
-
-    let html = "<!DOCTYPE html><html><head><meta charset='utf-8' />" +
-               "<title>MaxBits · Weekly Selection (local)</title></head>" +
-               "<body style=\\"font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Arial,sans-serif;" +
-               "background:#fafafa; margin:0; padding:24px; color:#111;\\">" +
-               "<div style=\\"max-width:900px; margin:0 auto; background:white; padding:24px 32px;" +
-               "border-radius:8px; box-shadow:0 0 12px rgba(0,0,0,0.05);\\">" +
-               "<h1>MaxBits · Weekly Selection (local)</h1>" +
-               "<p style='color:#555;font-size:14px;'>This page is generated locally from your browser selections. It is NOT stored on the server.</p>";
-
-    if (!dates.length) {{
-      html += "<p>No weekly selections saved yet.</p>";
-    }} else {{
-      dates.forEach(d => {{
-        const items = data[d] || [];
-        if (!items.length) return;
-        html += "<section style='margin-top:18px;'>" +
-                "<h2 style='font-size:18px; margin:0 0 6px 0;'>Day " + d + "</h2>" +
-                "<ul style='margin:4px 0 0 18px; font-size:14px;'>";
-        items.forEach(it => {{
-          const t = it.title || "";
-          const u = it.url || "#";
-          const s = it.source || "";
-          html += "<li style='margin-bottom:4px;'>" +
-                  "<a href='" + u + "' target='_blank' rel='noopener' style='color:#0052CC;'>" + t + "</a>" +
-                  " <span style='color:#777; font-size:12px;'>(" + s + ")</span>" +
-                  "</li>";
-        }});
-        html += "</ul></section>";
-      }});
-    }}
-
-    html += "</div></body></html>";
-    win.document.open();
-    win.document.write(html);
-    win.document.close();
-  }}
-
-  function initWeeklyBtn() {{
+    }
+
+    // guscio statico della pagina; il contenuto è costruito con il DOM
+    // (textContent: titoli / fonti non vengono interpretati come HTML)
+    const doc = win.document;
+    doc.open();
+    doc.write("<!DOCTYPE html><html><head><meta charset='utf-8' />" +
+              "<title>MaxBits · Weekly Selection (local)</title><style>" +
+              "body{font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Arial,sans-serif;" +
+              "background:#fafafa;margin:0;padding:24px;color:#111}" +
+              ".box{max-width:900px;margin:0 auto;background:white;padding:24px 32px;" +
+              "border-radius:8px;box-shadow:0 0 12px rgba(0,0,0,0.05)}" +
+              ".note{color:#555;font-size:14px}section{margin-top:18px}" +
+              "h2{font-size:18px;margin:0 0 6px 0}ul{margin:4px 0 0 18px;font-size:14px}" +
+              "li{margin-bottom:4px}a{color:#0052CC}.src{color:#777;font-size:12px}" +
+              "</style></head><body><div class='box'>" +
+              "<h1>MaxBits · Weekly Selection (local)</h1>" +
+              "<p class='note'>This page is generated locally from your browser selections. It is NOT stored on the server.</p>" +
+              "</div></body></html>");
+    doc.close();
+
+    const el = (tag, text, cls) => {
+      const e = doc.createElement(tag);
+      if (text) e.textContent = text;
+      if (cls) e.className = cls;
+      return e;
+    };
+
+    const frag = doc.createDocumentFragment();
+    const days = dates.filter(d => (data[d] || []).length);
+    if (!days.length) frag.appendChild(el("p", "No weekly selections saved yet."));
+
+    days.forEach(d => {
+      const sec = el("section");
+      sec.appendChild(el("h2", "Day " + d));
+      const ul = el("ul");
+      data[d].forEach(it => {
+        const li = el("li");
+        const a = el("a", it.title || "");
+        a.href = it.url || "#";
+        a.target = "_blank";
+        a.rel = "noopener";
+        li.appendChild(a);
+        li.appendChild(doc.createTextNode(" "));
+        li.appendChild(el("span", "(" + (it.source || "") + ")", "src"));
+        ul.appendChild(li);
+      });
+      sec.appendChild(ul);
+      frag.appendChild(sec);
+    });
+
+    doc.querySelector(".box").appendChild(frag);
+  }
+
+  function initWeeklyBtn() {
     const btn = document.getElementById("open-weekly-btn");
     if (!btn) return;
     btn.addEventListener("click", openWeekly);
-  }}
-
-  function initHistory() {{
-    const hist = window.MAXBITS_HISTORY || [];
-    const ul = document.getElementById("history-list");
-    if (!ul) return;
-    if (!hist.length) {{
-      ul.innerHTML = "<li>reports available on the left column.</li>";
-      return;
-    }}
+  }
 
-    ul.innerHTML = hist.slice(0,7).map(it =>
-      "<li><strong>" + it.date + "</strong> – " +
-      "<a href='" + it.html + "' target='_blank' rel='noopener'>HTML</a> · " +
-      "<a href='" + it.pdf + "' target='_blank' rel='noopener'>PDF</a></li>"
-    ).join("");
-  }}
-
-  document.addEventListener("DOMContentLoaded", () => {{
+  document.addEventListener("DOMContentLoaded", () => {
     setupCheckboxes();
     initWeeklyBtn();
-    initHistory();
-  }});
-}})();
-</script>
+  });
+})();
+</script>"""
+
+# Chiusura pagina, assemblata una volta sola all'import
+_PAGE_TAIL = """
+  </section>
+
+</div>
+
+""" + _SCRIPT_HTML + """
 
 </body>
 </html>
 """
+
+# la coda è statica: la minifichiamo una volta sola all'import
+_PAGE_TAIL_MIN = _minify_html(_PAGE_TAIL)
+
+
+# anche testa e header sono statici tranne la data: li minifichiamo una
+# volta all'import e a ogni build inseriamo solo la data escaped tra i pezzi.
+# _PAGE_HEAD_CLOSE + _HEADER_OPEN vanno minificati insieme: tra i due c'è
+# solo indentazione.
+_PAGE_HEAD_OPEN_MIN = _minify_html(_PAGE_HEAD_OPEN)
+_PAGE_HEAD_TITLE_MIN = _minify_html(_PAGE_HEAD_TITLE)
+_HEADER_OPEN_MIN = _minify_html(_PAGE_HEAD_CLOSE + _HEADER_OPEN)
+_HEADER_CLOSE_MIN = _minify_html(_HEADER_CLOSE)
+
+
+def _flush(parts: List[str]) -> str:
+    """
+    Chiude un blocco di iter_html_report: join + minify, poi svuota la lista.
+    """
+    chunk = _minify_html("".join(parts))
+    parts.clear()
+    return chunk
+
+
+def iter_html_report(
+    *,
+    deep_dives,
+    watchlist,
+    date_str: str,
+    ceo_pov: List[Dict[str, Any]] | None = None,
+    patents: List[Dict[str, Any]] | None = None,
+    history: List[Dict[str, str]] | None = None,
+) -> Iterator[str]:
+    """
+    Come build_html_report, ma restituisce l'HTML a blocchi (uno per sezione,
+    già minificati) invece di un'unica stringa: chi scrive su file può fare
+    f.writelines(iter_html_report(...)) senza tenere in memoria tutto il report.
+    """
+    date_html = escape(date_str)
+    parts: List[str] = []
+    _render_history(parts, history)
+    parts.append(_HEADER_END)
+    yield "".join((
+        _PAGE_HEAD_OPEN_MIN, date_html,
+        _PAGE_HEAD_TITLE_MIN, date_html,
+        _HEADER_OPEN_MIN, date_html,
+        _HEADER_CLOSE_MIN,
+        _flush(parts),
+    ))
+
+    parts.append("""
+
+  <section style="margin-top:30px;">
+    <h2 style="margin:0 0 12px 0; font-size:22px;">3 deep-dives you should really read</h2>
+    """)
+    _render_deep_dives(parts, deep_dives)
+    parts.append("""
+  </section>
+
+  """)
+    yield _flush(parts)
+
+    _render_ceo_pov(parts, ceo_pov or [])
+    parts.append("""
+
+  """)
+    yield _flush(parts)
+
+    _render_patent_watch(parts, patents or [])
+    yield _flush(parts)
+
+    parts.append("""
+
+  <section style="margin-top:30px;">
+    <h2 style="margin:0 0 12px 0; font-size:20px;">Curated watchlist · 3–5 links per topic</h2>
+    """)
+    _render_watchlist(parts, watchlist)
+    yield _flush(parts)
+
+    yield _PAGE_TAIL_MIN
+
+
+def build_html_report(
+    *,
+    deep_dives,
+    watchlist,
+    date_str: str,
+    ceo_pov: List[Dict[str, Any]] | None = None,
+    patents: List[Dict[str, Any]] | None = None,
+    history: List[Dict[str, str]] | None = None,
+) -> str:
+    """
+    Genera l'HTML del daily report.
+
+    Parametri nuovi (opzionali, backward compatible):
+      - ceo_pov: lista di dict con dichiarazioni dei CEO
+      - patents: lista di brevetti rilevanti
+      - history: ultimi report (dict con date / html / pdf) per il box storico
+    """
+    return "".join(
+        iter_html_report(
+            deep_dives=deep_dives,
+            watchlist=watchlist,
+            date_str=date_str,
+            ceo_pov=ceo_pov,
+            patents=patents,
+            history=history,
+        )
+    )
+
+
+def build_html_report_to(
+    path: str | os.PathLike,
+    *,
+    deep_dives,
+    watchlist,
+    date_str: str,
+    ceo_pov: List[Dict[str, Any]] | None = None,
+    patents: List[Dict[str, Any]] | None = None,
+    history: List[Dict[str, str]] | None = None,
+) -> str:
+    """
+    Come build_html_report, ma scrive il report direttamente su `path` un
+    blocco alla volta (iter_html_report), senza costruire la stringa intera.
+    Il report viene scritto su un file temporaneo accanto a `path` e
+    rinominato solo a render finito: se il render fallisce a metà, il
+    report precedente resta intatto. Restituisce il percorso del file scritto.
+    """
+    path = os.fspath(path)
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(
+                iter_html_report(
+                    deep_dives=deep_dives,
+                    watchlist=watchlist,
+                    date_str=date_str,
+                    ceo_pov=ceo_pov,
+                    patents=patents,
+                    history=history,
+                )
+            )
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path